@@ -11,8 +11,12 @@
 # Author: Sumayer Khan
 # Date: 17/09/2025
 
+import orjson
 import requests
+import requests_cache
 import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from dotenv import load_dotenv
 import streamlit as st
 
@@ -30,6 +34,52 @@ except Exception:
 # Fallback to environment variable
 API_KEY = _SECRET_API_KEY or os.getenv("API_KEY")
 
+# Fail fast on misconfigured deployments: without a key every request
+# would still travel to the API with appid=None and only fail downstream
+# as an opaque KeyError. Raising at import time means zero wasted
+# round-trips and an error message that names the actual problem.
+if not API_KEY:
+    raise RuntimeError("API_KEY is not configured. Add it to a .env file "
+                       "or to Streamlit secrets.")
+
+# Shared HTTP session for all OpenWeatherMap calls
+# Reusing one session keeps the TCP+TLS connection alive between requests,
+# so only the first call pays the handshake cost. The mounted adapter keeps
+# a small pool of connections around for reuse.
+# The session additionally caches successful responses in a local SQLite
+# file: st.cache_data is per-process, so this survives Streamlit restarts
+# and is shared between workers in multi-worker deployments. expire_after
+# matches the in-process TTL so both layers agree on freshness.
+_SESSION = requests_cache.CachedSession("owm_cache",
+                                        backend="sqlite",
+                                        expire_after=600,
+                                        allowable_codes=(200,))
+_SESSION.mount("https://", requests.adapters.HTTPAdapter(pool_connections=4,
+                                                         pool_maxsize=8))
+
+# Ask for gzip explicitly rather than relying on the library default, so
+# the compressed wire format survives any future session/transport swap.
+# The repetitive JSON structure of forecast payloads compresses several
+# times smaller; requests decompresses transparently before the size cap
+# and orjson parse see the body.
+_SESSION.headers.update({"Accept-Encoding": "gzip"})
+
+# Upper bound on how many response bytes get_data will parse
+# A full 5-day forecast payload is ~20 KB, so anything near this limit is
+# a malfunctioning or hostile endpoint rather than real forecast data.
+# This is a parse guard, not a transport bound: the caching session
+# buffers the whole body in order to store it, so the cap only limits
+# what reaches orjson and the in-process forecast caches.
+_MAX_RESPONSE_BYTES = 256_000
+
+# In-flight request deduplication
+# If a second caller asks for a place that is already being fetched
+# (e.g. rapid slider wiggling re-enters get_data before the first
+# request finishes), it waits on the first caller's Future instead
+# of issuing a duplicate API call. Saves both latency and API quota.
+_INFLIGHT = {}
+_INFLIGHT_LOCK = threading.Lock()
+
 
 def get_data(place, forcast_days):
     # """
@@ -70,30 +120,124 @@ def get_data(place, forcast_days):
     #     - Data points are provided every 3 hours (8 per day)
     #     - Requires a valid API key in environment variables
 
+    # Empty input means there is nothing to forecast - skip the network
+    # entirely rather than asking the API to reject it
+    if not place:
+        return []
+
+    # The slider is the most common interaction, so the full 5-day payload
+    # is fetched once per place and the requested window sliced locally.
+    # Moving the slider then never touches the network - every position
+    # from 1 to 5 days is served by the same cached fetch.
+    return _fetch_full(place)[:8 * forcast_days]
+
+
+# Cache full forecasts in Streamlit's in-process memo table so repeat
+# queries for the same place inside the TTL window skip the network
+# round-trip entirely. Streamlit reruns the whole script on every widget
+# interaction, so without this every slider move or selectbox change
+# would trigger a fresh HTTPS call.
+# - ttl=600: forecasts update every 3 hours, so 10 minutes is safely fresh
+# - max_entries=128: bounds memory for long-running sessions
+@st.cache_data(ttl=600, max_entries=128)
+def _fetch_full(place):
+    # Returns the complete 40-slot forecast for a place, deduplicating
+    # concurrent identical requests.
+
+    # Atomically check whether this place is already being fetched;
+    # if so, wait for its result instead of launching a second HTTP call
+    with _INFLIGHT_LOCK:
+        future = _INFLIGHT.get(place)
+        is_owner = future is None
+        if is_owner:
+            future = Future()
+            _INFLIGHT[place] = future
+
+    if not is_owner:
+        # Another caller is fetching this place right now - share its result
+        return future.result()
+
+    try:
+        filtered_data = _fetch(place)
+        future.set_result(filtered_data)
+        return filtered_data
+    except BaseException as error:
+        # Propagate the failure to any waiters as well as this caller
+        future.set_exception(error)
+        raise
+    finally:
+        # Drop the entry so the next cache miss starts a fresh request
+        with _INFLIGHT_LOCK:
+            _INFLIGHT.pop(place, None)
+
+
+def _fetch(place):
+    # Performs the actual HTTP request to the OpenWeatherMap API.
+
+    # Separated from _fetch_full so the caching and in-flight deduplication
+    # layers wrap around a single plain network call. Always requests the
+    # full 5-day payload (40 slots); callers slice what they need.
+
     # Construct the API URL with the place parameter and API key
     # Using the 5-day weather forecast endpoint
-    url = f"http://api.openweathermap.org/data/2.5/forecast?q={place}&appid={API_KEY}&units=metric"
-    
-    # Make the HTTP GET request to the OpenWeatherMap API
-    response = requests.get(url)
-    
+    url = (f"https://api.openweathermap.org/data/2.5/forecast"
+           f"?q={place}&appid={API_KEY}&units=metric")
+
+    # Make the HTTP GET request through the shared keep-alive session
+    # timeout=(connect, read) so a hung endpoint can't block indefinitely
+    # stream=True leaves the body read to the capped read below (though
+    # the caching session will already have buffered it for storage)
+    response = _SESSION.get(url, timeout=(3.05, 10), stream=True)
+
+    # Surface 4xx/5xx responses as HTTP errors here instead of letting
+    # them fail later as opaque KeyErrors in main.py
+    response.raise_for_status()
+
+    # Parse at most _MAX_RESPONSE_BYTES of the (decompressed) body so an
+    # oversized response is rejected instead of handed to orjson and the
+    # forecast caches. See the note on _MAX_RESPONSE_BYTES: the caching
+    # session has already buffered the full body by this point, so this
+    # caps parsing and cache growth, not peak transport memory.
+    raw = response.raw.read(_MAX_RESPONSE_BYTES, decode_content=True)
+    if len(raw) == _MAX_RESPONSE_BYTES:
+        raise ValueError(
+            f"OpenWeatherMap response exceeded {_MAX_RESPONSE_BYTES} bytes")
+
     # Parse the JSON response into a Python dictionary
-    data = response.json()
-    
+    # orjson decodes the payload several times faster than the stdlib json
+    # module and returns ordinary dicts/lists, so nothing downstream changes
+    data = orjson.loads(raw)
+
     # Extract the forecast list from the response
-    # The "list" key contains all forecast data points
+    # The "list" key contains all 40 forecast data points
     filtered_data = data["list"]
-    
-    # Calculate the number of data points needed
-    # OpenWeatherMap provides 8 data points per day (every 3 hours)
-    nr_values = 8 * forcast_days
-    
-    # Slice the data to get only the requested number of forecast days
-    filtered_data = filtered_data[:nr_values]
 
     return filtered_data
 
 
+def get_data_many(places, forcast_days):
+    # Fetches forecast data for several places concurrently.
+
+    # Each place is fetched on its own worker thread through the shared
+    # keep-alive session, so the wall time for N cities is roughly the
+    # slowest single request instead of the sum of all of them. Results
+    # come back in the same order as the input places.
+
+    # Args:
+    #     places (list[str]): City/location names to fetch forecasts for.
+    #     forcast_days (int): Number of days for the forecast (1-5 days).
+
+    # Returns:
+    #     list: One get_data() result (list of forecast dicts) per place,
+    #           in input order.
+
+    # Worker count is capped to match the session's connection pool so
+    # threads never outnumber the reusable connections
+    with ThreadPoolExecutor(max_workers=min(8, max(1, len(places)))) as pool:
+        return list(pool.map(lambda place: get_data(place, forcast_days),
+                             places))
+
+
 # Main execution block for testing purposes
 if __name__ == "__main__":
     # Test block to verify the get_data function works correctly.
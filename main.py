@@ -22,9 +22,88 @@
 # Author: Sumayer Khan Sajid
 # Date: 17/09/2025
 
+import re
+
+import pandas as pd
+import requests
 import streamlit as st
-import plotly.express as px 
-from backend import get_data
+import plotly.express as px
+from PIL import Image
+
+# backend refuses to import without a configured API key; surface that
+# as a page-level error instead of a stack trace, and stop before any
+# widgets render so the worker never sends a doomed request
+try:
+    from backend import get_data
+except RuntimeError as config_error:
+    st.error(str(config_error))
+    st.stop()
+
+# Accepts plausible place names ("London", "Rio de Janeiro", "São Paulo",
+# "London,UK") and rejects whitespace-only or junk input before any network
+# call is made. [^\W\d_] matches a letter in any script, so accented and
+# non-Latin city names pass just like ASCII ones.
+_PLACE_RE = re.compile(r"^(?:[^\W\d_]|[ .,'\-]){2,64}$")
+
+
+# Sky Icon Preloading
+# ===================
+
+# Icon tile size in pixels, matching the previous per-image display width
+_ICON_SIZE = 115
+
+
+@st.cache_resource
+def _sky_icons():
+    # Load the four weather condition PNGs into memory once per process.
+    # The decoded, uniformly sized RGBA tiles are pasted into per-day
+    # strips below, so no file is re-read or re-decoded on reruns.
+    paths = {"Clear": "images/clear.png",
+             "Clouds": "images/cloud.png",
+             "Rain": "images/rain.png",
+             "Snow": "images/snow.png"}
+    icons = {}
+    for condition, path in paths.items():
+        icons[condition] = (Image.open(path)
+                            .convert("RGBA")
+                            .resize((_ICON_SIZE, _ICON_SIZE)))
+    return icons
+
+
+@st.cache_data
+def _compose_icon_strip(conditions):
+    # Pastes the icons for one forecast day into a single horizontal PNG.
+
+    # Sending one composite per day means Streamlit serializes a handful
+    # of asset blobs over the websocket instead of one per 3-hour slot
+    # (up to 40). Memoized on the condition tuple, so a day of e.g. all
+    # "Clouds" is composed exactly once per process.
+    # Conditions without a dedicated icon (e.g. "Mist", "Haze") fall back
+    # to the clear-sky icon instead of raising KeyError.
+    icons = _sky_icons()
+    fallback_icon = icons["Clear"]
+    strip = Image.new("RGBA", (_ICON_SIZE * len(conditions), _ICON_SIZE))
+    for index, condition in enumerate(conditions):
+        strip.paste(icons.get(condition, fallback_icon),
+                    (_ICON_SIZE * index, 0))
+    return strip
+
+
+@st.cache_data
+def _build_temp_fig(forecast):
+    # Builds the temperature line chart for a given forecast window.
+
+    # px.line serializes the whole figure to JSON on every call, so this
+    # is memoized on the two columns it plots - toggling unrelated widgets
+    # (e.g. the selectbox) reuses the already-built figure instead of
+    # re-serializing it on each rerun. Callers must pass only the "dt_txt"
+    # and "main.temp" columns: the full forecast frame's "weather" column
+    # holds lists of dicts, which pandas hashing cannot digest and would
+    # push Streamlit onto its slow pickle fallback every rerun.
+    return px.line(forecast,
+                   x="dt_txt",
+                   y="main.temp",
+                   labels={"dt_txt": "Date", "main.temp": "Temperatures (C)"})
 
 # Configure the main page layout and title
 st.title("Weather Forcast For The Next Days")
@@ -34,7 +113,9 @@ st.title("Weather Forcast For The Next Days")
 
 # Text input for city/location name
 # Users can enter any city name, optionally with country code for specificity
-place = st.text_input("Place: ")
+# Stray surrounding whitespace is dropped so " London " and "London" are
+# the same query (and the same cache key)
+place = st.text_input("Place: ").strip()
 
 # Slider for selecting forecast duration
 # Range: 1-5 days (limited by OpenWeatherMap free tier)
@@ -58,11 +139,30 @@ st.subheader(f"{option} for the next {days} days in {place}")
 
 # Only proceed if user has entered a city name
 if place:
-    try: 
+    # Cheap client-side validation: obviously malformed input gets a
+    # warning immediately instead of wasting a round-trip and API quota
+    if not _PLACE_RE.match(place):
+        st.warning("Please enter a valid place name (letters only, "
+                   "optionally with a country code like 'London,UK').")
+        st.stop()
+
+    # Remember place names the API already rejected this session so
+    # repeated submissions of the same typo don't re-hit the network
+    known_bad = st.session_state.setdefault("known_bad_places", set())
+    if place in known_bad:
+        st.error("City not found. Please try again.")
+        st.stop()
+
+    try:
         # Fetch weather data using the backend module
         # This returns a list of forecast data points (8 per day)
         filtered_data = get_data(place, days)
-        
+
+        # Flatten the nested forecast dicts into a columnar DataFrame once;
+        # both view branches then read whole columns ("main.temp", "dt_txt")
+        # in a single C-level pass instead of per-entry Python dict lookups
+        forecast = pd.json_normalize(filtered_data)
+
         # Temperature Visualization Branch
         # ===============================
         if option == "Temperature":
@@ -80,15 +180,10 @@ if place:
             # - Y-axis: Temperature in Celsius
 
             
-            temperature = [(entry["main"]["temp"]) for entry in filtered_data]
-            
-            # Extract datetime strings for chart x-axis labels
-            dates = [entry["dt_txt"] for entry in filtered_data]
-            
             # Create interactive line chart using Plotly
-            figure = px.line(x=dates, 
-                           y=temperature,
-                           labels={"x": "Date", "y": "Temperatures (C)"})
+            # Only the two plotted columns are passed so the cached builder
+            # gets a cleanly hashable key
+            figure = _build_temp_fig(forecast[["dt_txt", "main.temp"]])
             
             # Display the chart in the Streamlit interface
             st.plotly_chart(figure)
@@ -109,35 +204,36 @@ if place:
             # - Rain: rain.png (rainy weather)
             # - Snow: snow.png (snowy conditions)
 
+
+            # Extract each entry's main weather category (Clear, Clouds,
+            # Rain, Snow) from the "weather" column
+            conditions = forecast["weather"].map(lambda w: w[0]["main"]).tolist()
+
+            # Datetime strings double as the image captions
+            caption = forecast["dt_txt"].tolist()
+
+            # Display one batched icon strip per forecast day (8 slots),
+            # with the covered timestamps joined into a single caption
+            for start in range(0, len(conditions), 8):
+                strip = _compose_icon_strip(tuple(conditions[start:start + 8]))
+                st.image(strip, caption=" | ".join(caption[start:start + 8]))
             
-            # Define mapping between weather conditions and icon file paths
-            # Icons should be stored in the 'images/' directory
-            images = {"Clear": "images/clear.png",
-                     "Clouds": "images/cloud.png",
-                     "Rain": "images/rain.png",
-                     "Snow": "images/snow.png"}
-            
-            # Extract weather condition for each forecast entry
-            # Uses the main weather category (Clear, Clouds, Rain, Snow)
-            sky = [entry["weather"][0]["main"] for entry in filtered_data]
-            
-            # Map weather conditions to corresponding image file paths
-            image_paths = [images[condition] for condition in sky]
-            
-            # Extract datetime strings for image captions
-            caption = [entry["dt_txt"] for entry in filtered_data]
-            
-            # Display weather condition images with timestamps
-            # width=115: Sets consistent icon size
-            # caption: Shows date/time below each icon
-            st.image(image_paths, width=115, caption=caption)
-            
-    except KeyError as e:
+    except (KeyError, requests.exceptions.HTTPError) as error:
         # Handle cases where the city is not found or API response is invalid.
-        
+
         # Common causes:
-        # - Misspelled city name
+        # - Misspelled city name (the API answers 404, raised as HTTPError)
         # - City not in OpenWeatherMap database
         # - API response structure changed
         # - Network connectivity issues
-        st.error("City not found. Please try again.")
\ No newline at end of file
+
+        # Only a 404 means the place itself is wrong; remember just those
+        # so the known-bad short-circuit never pins a transient failure
+        # (rate limit, server error) on a perfectly valid city
+        response = getattr(error, "response", None)
+        if response is not None and response.status_code == 404:
+            known_bad.add(place)
+            st.error("City not found. Please try again.")
+        else:
+            st.error("Could not fetch the forecast right now. "
+                     "Please try again in a moment.")
\ No newline at end of file